@@ -12,17 +12,87 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import bpy
+import heapq
 import os
+import stat
 import math
 import random
+import numpy as np
 from bpy.types import Panel, PropertyGroup, Operator
 from bpy.props import PointerProperty, StringProperty, FloatProperty, EnumProperty, BoolProperty
+from bpy.app.handlers import persistent
+from bpy_extras import anim_utils
+from mathutils import Euler, Matrix, Quaternion, Vector
 
 
-def get_armatures(self, context):
-    """Return a list of armature objects for the enum property."""
+# Items returned by dynamic enum callbacks, keyed by callback name:
+# (version, discriminator, items). Python must keep a reference to these or
+# Blender can show garbage strings, and keeping them lets redraws reuse the
+# list until the data changes. One slot per callback keeps the cache bounded.
+_enum_items_cache = {}
+_enum_items_version = 0
+
+
+def invalidate_enum_items():
+    """Mark all cached enum items as stale so they are rebuilt on next access."""
+    global _enum_items_version
+    _enum_items_version += 1
+
+
+def get_cached_enum_items(name, discriminator, build_items):
+    """Return cached enum items for a callback, rebuilding them if they are stale."""
+    cached = _enum_items_cache.get(name)
+    if cached is not None and cached[0] == _enum_items_version and cached[1] == discriminator:
+        return cached[2]
+    items = build_items()
+    _enum_items_cache[name] = (_enum_items_version, discriminator, items)
+    return items
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Invalidate cached enum items when objects or bone collections change."""
+    if (depsgraph.id_type_updated('OBJECT') or depsgraph.id_type_updated('COLLECTION')
+            or depsgraph.id_type_updated('ARMATURE')):
+        invalidate_enum_items()
+
+
+# Owner of this module's message bus subscriptions
+_msgbus_owner = object()
+
+
+def subscribe_to_renames():
+    """Invalidate cached enum items when an object or bone collection is renamed.
+    
+    Renames don't trigger a depsgraph update, so they are watched via msgbus.
+    """
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "name"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=invalidate_enum_items,
+    )
+    # Bone collections only exist in Blender 4.0+
+    if hasattr(bpy.types, 'BoneCollection'):
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.BoneCollection, "name"),
+            owner=_msgbus_owner,
+            args=(),
+            notify=invalidate_enum_items,
+        )
+
+
+@persistent
+def on_load_post(*args):
+    """Drop cached enum items and restore msgbus subscriptions after loading a file."""
+    invalidate_enum_items()
+    subscribe_to_renames()
+
+
+def build_armature_items(scene):
+    """Build enum items for the armature objects in a scene."""
     items = []
-    for i, obj in enumerate(bpy.data.objects):
+    for i, obj in enumerate(scene.objects):
         if obj.type == 'ARMATURE':
             items.append((obj.name, obj.name, f"Armature: {obj.name}", 'ARMATURE_DATA', i))
     if not items:
@@ -30,67 +100,116 @@ def get_armatures(self, context):
     return items
 
 
-def get_bone_collections(self, context):
-    """Return a list of bone collections for the selected armature."""
+def get_armatures(self, context):
+    """Return a list of armature objects in the scene for the enum property."""
+    # The scene owning these settings; context can be None and may be another scene
+    scene = self.id_data
+    return get_cached_enum_items('armatures', scene.as_pointer(), lambda: build_armature_items(scene))
+
+
+def build_bone_collection_items(armature_data):
+    """Build enum items for the bone collections of an armature."""
     items = [
         ('ALL', "All Bones", "Monitor all bones in the armature", 'BONE_DATA', 0),
         ('SELECTED', "Selected Bones", "Monitor only bones currently selected in Pose Mode", 'RESTRICT_SELECT_OFF', 1),
     ]
+    if armature_data is not None:
+        for i, bcol in enumerate(armature_data.collections):
+            items.append((bcol.name, bcol.name, f"Bone Collection: {bcol.name}", 'GROUP_BONE', i + 2))
+    return items
+
+
+def get_bone_collections(self, context):
+    """Return a list of bone collections for the selected armature."""
+    armature_name = self.z_crossing_armature
     
-    settings = context.scene.vse_event_sound_settings
-    armature_name = settings.z_crossing_armature
-    
-    if armature_name and armature_name != 'NONE' and armature_name in bpy.data.objects:
-        armature_obj = bpy.data.objects[armature_name]
-        if armature_obj.type == 'ARMATURE' and armature_obj.data:
-            armature_data = armature_obj.data
-            # Blender 4.0+ uses collections instead of bone_groups
-            if hasattr(armature_data, 'collections'):
-                for i, bcol in enumerate(armature_data.collections):
-                    items.append((bcol.name, bcol.name, f"Bone Collection: {bcol.name}", 'GROUP_BONE', i + 2))
-            # Fallback for older Blender versions with bone_groups
-            elif hasattr(armature_data, 'bone_groups') and armature_data.bone_groups:
-                for i, bg in enumerate(armature_data.bone_groups):
-                    items.append((bg.name, bg.name, f"Bone Group: {bg.name}", 'GROUP_BONE', i + 2))
+    armature_obj = bpy.data.objects.get(armature_name) if armature_name != 'NONE' else None
+    armature_data = None
+    if armature_obj is not None and armature_obj.type == 'ARMATURE' and armature_obj.data:
+        armature_data = armature_obj.data
     
-    return items
+    if armature_data is None:
+        discriminator = None
+    else:
+        # Including the count catches added/removed collections without a depsgraph update
+        discriminator = (armature_data.as_pointer(), len(armature_data.collections))
+    return get_cached_enum_items('bone_collections', discriminator, lambda: build_bone_collection_items(armature_data))
+
 
+# The add-on location can't change while it is loaded, so resolve it once
+ADDON_DIR = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_SOUND_PATH = os.path.join(ADDON_DIR, "geiger_counter_sound.wav")
+DEFAULT_SOUNDS_DIR = os.path.join(ADDON_DIR, "sounds")
 
-SUPPORTED_AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.flac', '.aiff', '.aif'}
+SUPPORTED_AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.ogg', '.flac', '.aiff', '.aif'})
+# Same extensions as a tuple, for str.endswith()
+SUPPORTED_AUDIO_SUFFIXES = tuple(sorted(SUPPORTED_AUDIO_EXTENSIONS))
+
+
+# Sorted sound file names per folder, keyed by folder path: (mtime_ns, sound_files).
+# A folder's mtime changes whenever files are added, removed or renamed in it.
+_sound_files_cache = {}
 
 
 def get_sound_files_from_folder(folder_path):
     """Get all supported audio files from a folder."""
-    if not folder_path or not os.path.isdir(folder_path):
+    if not folder_path:
         return []
+    try:
+        folder_stat = os.stat(folder_path)
+    except OSError:
+        folder_stat = None
+    if folder_stat is None or not stat.S_ISDIR(folder_stat.st_mode):
+        # Drop the stale listing so callers keyed on it see the folder is gone
+        _sound_files_cache.pop(folder_path, None)
+        return []
+    
+    cached = _sound_files_cache.get(folder_path)
+    if cached is not None and cached[0] == folder_stat.st_mtime_ns:
+        return cached[1]
     
     sound_files = []
-    for filename in os.listdir(folder_path):
-        ext = os.path.splitext(filename)[1].lower()
-        if ext in SUPPORTED_AUDIO_EXTENSIONS:
-            sound_files.append(filename)
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(SUPPORTED_AUDIO_SUFFIXES) and entry.is_file():
+                sound_files.append(entry.name)
     
-    return sorted(sound_files)
+    sound_files.sort()
+    _sound_files_cache[folder_path] = (folder_stat.st_mtime_ns, sound_files)
+    return sound_files
 
 
-def get_sound_files_enum(self, context):
-    """Return a list of sound files for the enum property."""
-    settings = context.scene.vse_event_sound_settings
-    folder_path = bpy.path.abspath(settings.sound_folder)
-    
+def build_sound_file_items(sound_files):
+    """Build enum items for a list of sound file names."""
     items = []
-    sound_files = get_sound_files_from_folder(folder_path)
-    
     if not sound_files:
         items.append(('NONE', "No sounds found", "Select a folder with audio files", 'ERROR', 0))
     else:
         for i, filename in enumerate(sound_files):
             # Use filename as both identifier and display name
             items.append((filename, filename, f"Sound file: {filename}", 'SOUND', i))
-    
     return items
 
 
+def get_sound_files_enum(self, context):
+    """Return a list of sound files for the enum property."""
+    settings = context.scene.vse_event_sound_settings
+    folder_path = bpy.path.abspath(settings.sound_folder)
+    
+    sound_files = get_sound_files_from_folder(folder_path)
+    cached = _sound_files_cache.get(folder_path)
+    discriminator = (folder_path, cached[0] if cached is not None else None)
+    return get_cached_enum_items('sound_files', discriminator, lambda: build_sound_file_items(sound_files))
+
+
+def update_sound_folder(self, context):
+    """Store the folder name shown in the panel, so draw() doesn't recompute it."""
+    if self.sound_folder:
+        self.sound_folder_name = os.path.basename(os.path.normpath(self.sound_folder))
+    else:
+        self.sound_folder_name = ""
+
+
 class VSE_PG_EventSoundSettings(PropertyGroup):
     """Property group for event sound settings."""
     
@@ -99,6 +218,14 @@ class VSE_PG_EventSoundSettings(PropertyGroup):
         description="Path to folder containing sound files",
         subtype='DIR_PATH',
         default="",
+        update=update_sound_folder,
+    )
+    
+    sound_folder_name: StringProperty(
+        name="Sound Folder Name",
+        description="Display name of the sound folder",
+        default="",
+        options={'HIDDEN'},
     )
     
     sound_selection_mode: EnumProperty(
@@ -217,6 +344,10 @@ class VSE_PG_EventSoundSettings(PropertyGroup):
     )
 
 
+# Strip color tags COLOR_01 through COLOR_09 (Blender 4.0+)
+STRIP_COLOR_TAGS = tuple(f'COLOR_{i:02d}' for i in range(1, 10))
+
+
 def apply_strip_color_by_channel(strip, channel):
     """Apply a color tag to a strip based on the channel number.
     
@@ -226,7 +357,7 @@ def apply_strip_color_by_channel(strip, channel):
     if hasattr(strip, 'color_tag'):
         # Use channel to determine color (cycling through 9 colors)
         tag_index = ((channel - 1) % 9) + 1  # COLOR_01 to COLOR_09
-        strip.color_tag = f'COLOR_{tag_index:02d}'
+        strip.color_tag = STRIP_COLOR_TAGS[tag_index - 1]
 
 
 def get_bone_color_index(bone_name, bone_color_map):
@@ -250,32 +381,6 @@ def get_bone_color_index(bone_name, bone_color_map):
     return bone_color_map[bone_name]
 
 
-def apply_strip_color_by_bone(strip, bone_name, bone_color_map):
-    """Apply a color tag to a strip based on the bone name.
-    
-    Each unique bone gets a consistent color across all its strips.
-    """
-    # Blender 4.0+ uses color_tag (enum) with COLOR_01 through COLOR_09
-    if hasattr(strip, 'color_tag'):
-        tag_index = get_bone_color_index(bone_name, bone_color_map)
-        strip.color_tag = f'COLOR_{tag_index:02d}'
-
-
-def get_random_volume(base_volume, randomness):
-    """Calculate a random volume based on randomness factor.
-    
-    With randomness=0, returns base_volume.
-    With randomness=1, returns a value between 0 and base_volume.
-    """
-    if randomness <= 0:
-        return base_volume
-    
-    # Calculate the minimum volume based on randomness
-    # At randomness=1, min_volume=0. At randomness=0, min_volume=base_volume
-    min_volume = base_volume * (1.0 - randomness)
-    return random.uniform(min_volume, base_volume)
-
-
 def get_sequencer_scene(context):
     """Get the correct scene for the sequencer (handles Blender 5.0+ changes)"""
     # In Blender 5.0+, the sequencer uses a dedicated scene per workspace
@@ -284,41 +389,55 @@ def get_sequencer_scene(context):
     return context.scene
 
 
-def add_sound_strip(sed, name, filepath, channel, frame_start):
-    """Add a sound strip, handling different Blender API versions"""
-    # Try Blender 5.0+ API first (strips.new_sound)
-    if hasattr(sed, 'strips') and hasattr(sed.strips, 'new_sound'):
-        return sed.strips.new_sound(
-            name=name,
-            filepath=filepath,
-            channel=channel,
-            frame_start=frame_start
-        )
-    # Fall back to Blender 4.x API (sequences.new_sound)
-    elif hasattr(sed, 'sequences') and hasattr(sed.sequences, 'new_sound'):
-        return sed.sequences.new_sound(
-            name=name,
-            filepath=filepath,
-            channel=channel,
-            frame_start=frame_start
-        )
-    else:
-        raise RuntimeError("Could not find API to add sound strips")
+# Names of the SequenceEditor collections used for strips, resolved on first
+# use. They only depend on the Blender version, so probing once is enough.
+_new_strips_attr = None
+_all_strips_attr = None
+
+
+def get_new_strips_collection(sed):
+    """Get the collection strips are added to, handling different Blender API versions"""
+    global _new_strips_attr
+    if _new_strips_attr is None:
+        # Try Blender 5.0+ API first (strips.new_sound)
+        if hasattr(sed, 'strips') and hasattr(sed.strips, 'new_sound'):
+            _new_strips_attr = 'strips'
+        # Fall back to Blender 4.x API (sequences.new_sound)
+        elif hasattr(sed, 'sequences') and hasattr(sed.sequences, 'new_sound'):
+            _new_strips_attr = 'sequences'
+        else:
+            raise RuntimeError("Could not find API to add sound strips")
+    return getattr(sed, _new_strips_attr)
 
 
 def get_all_strips(sed):
-    """Get all strips/sequences, handling different Blender API versions"""
-    # Try Blender 5.0+ API first
-    if hasattr(sed, 'strips_all'):
-        return list(sed.strips_all)
-    elif hasattr(sed, 'strips'):
-        return list(sed.strips)
-    # Fall back to Blender 4.x API
-    elif hasattr(sed, 'sequences_all'):
-        return list(sed.sequences_all)
-    elif hasattr(sed, 'sequences'):
-        return list(sed.sequences)
-    return []
+    """Get the collection of all strips/sequences, handling different Blender API versions
+    
+    The collection is returned as-is (it supports len() and iteration);
+    call list() on it only where a snapshot is needed.
+    """
+    global _all_strips_attr
+    if _all_strips_attr is None:
+        # Try Blender 5.0+ API first, then fall back to Blender 4.x API
+        for attr in ('strips_all', 'strips', 'sequences_all', 'sequences'):
+            if hasattr(sed, attr):
+                _all_strips_attr = attr
+                break
+        else:
+            return ()
+    return getattr(sed, _all_strips_attr)
+
+
+def get_max_channel(sed):
+    """Return the highest channel used by any strip, or 0 if there are none."""
+    all_strips = get_all_strips(sed)
+    strip_count = len(all_strips)
+    if strip_count == 0:
+        return 0
+    # Copy all channels in one C-level call instead of iterating strips in Python
+    channels = np.empty(strip_count, dtype=np.int32)
+    all_strips.foreach_get('channel', channels)
+    return int(channels.max())
 
 
 def find_next_available_channel(sed):
@@ -328,27 +447,7 @@ def find_next_available_channel(sed):
     This ensures each new import batch starts on a fresh channel
     and gets a new color.
     """
-    all_strips = get_all_strips(sed)
-    if not all_strips:
-        return 1
-    
-    # Find the highest channel in use
-    max_channel = max(s.channel for s in all_strips)
-    
-    # Return the next channel above all existing strips
-    return max_channel + 1
-
-
-def strips_overlap(strip1, strip2):
-    """Check if two strips overlap in time."""
-    # Get start and end frames for each strip
-    start1 = strip1.frame_final_start if hasattr(strip1, 'frame_final_start') else strip1.frame_start
-    end1 = strip1.frame_final_end if hasattr(strip1, 'frame_final_end') else (strip1.frame_start + 48)
-    start2 = strip2.frame_final_start if hasattr(strip2, 'frame_final_start') else strip2.frame_start
-    end2 = strip2.frame_final_end if hasattr(strip2, 'frame_final_end') else (strip2.frame_start + 48)
-    
-    # Check for overlap (strips overlap if one starts before the other ends)
-    return start1 < end2 and start2 < end1
+    return get_max_channel(sed) + 1
 
 
 def separate_overlapping_strips(strips, base_channel):
@@ -356,42 +455,299 @@ def separate_overlapping_strips(strips, base_channel):
     
     Uses a greedy algorithm: for each strip, find the lowest channel
     where it doesn't overlap with any already-placed strip.
+    
+    Strips are swept in start order while tracking when each channel
+    frees up, so each strip costs O(log channels) instead of a check
+    against every strip already placed.
     """
     if not strips:
         return
     
+    # Get (start, end) frames for each strip; all strips share one API,
+    # so the attribute probe runs once instead of per strip
+    if hasattr(strips[0], 'frame_final_start'):
+        strip_ranges = [((strip.frame_final_start, strip.frame_final_end), strip) for strip in strips]
+    else:
+        strip_ranges = [((strip.frame_start, strip.frame_start + 48), strip) for strip in strips]
+    
     # Sort strips by their start frame
-    sorted_strips = sorted(strips, key=lambda s: s.frame_final_start if hasattr(s, 'frame_final_start') else s.frame_start)
-    
-    # Track which strips are on which channel
-    # channel_strips[channel] = list of strips on that channel
-    channel_strips = {}
-    
-    for strip in sorted_strips:
-        # Find the lowest channel where this strip fits without overlap
-        test_channel = base_channel
-        while True:
-            if test_channel not in channel_strips:
-                # Empty channel, use it
-                channel_strips[test_channel] = [strip]
-                strip.channel = test_channel
-                break
-            
-            # Check if strip overlaps with any existing strip on this channel
-            has_overlap = False
-            for existing_strip in channel_strips[test_channel]:
-                if strips_overlap(strip, existing_strip):
-                    has_overlap = True
-                    break
-            
-            if not has_overlap:
-                # No overlap, use this channel
-                channel_strips[test_channel].append(strip)
-                strip.channel = test_channel
-                break
-            
-            # Try next channel
-            test_channel += 1
+    strip_ranges.sort(key=lambda item: item[0][0])
+    
+    busy_channels = []  # min-heap of (end frame, channel) for occupied channels
+    free_channels = []  # min-heap of used channels that are free again
+    next_channel = base_channel
+    
+    for (start, end), strip in strip_ranges:
+        # Release channels whose last strip ended before this one starts
+        while busy_channels and busy_channels[0][0] <= start:
+            heapq.heappush(free_channels, heapq.heappop(busy_channels)[1])
+        
+        # Reuse the lowest free channel, or open a new one above all used channels
+        if free_channels:
+            channel = heapq.heappop(free_channels)
+        else:
+            channel = next_channel
+            next_channel += 1
+        
+        # Most strips stay on the channel they were created on; skip those
+        # writes, since every channel assignment re-runs Blender's overlap handling
+        if strip.channel != channel:
+            strip.channel = channel
+        heapq.heappush(busy_channels, (end, channel))
+
+
+# Object-level F-Curve paths that move the armature as a whole
+OBJECT_TRANSFORM_PATHS = {
+    'location', 'rotation_euler', 'rotation_quaternion', 'rotation_axis_angle', 'scale',
+    'delta_location', 'delta_rotation_euler', 'delta_rotation_quaternion', 'delta_scale',
+}
+
+# Pose bone F-Curve paths that feed into a bone's local transform
+POSE_BONE_TRANSFORM_PATHS = {
+    'location', 'rotation_quaternion', 'rotation_euler', 'rotation_axis_angle', 'scale',
+}
+
+POSE_BONES_PATH_PREFIX = 'pose.bones["'
+
+
+def get_action_fcurves(anim_data):
+    """Get the F-Curves of the assigned action, handling layered actions (Blender 4.4+)"""
+    action = anim_data.action
+    if action is None:
+        return []
+    # Legacy action.fcurves is gone in newer Blender, where only the layered API exists
+    fcurves = getattr(action, 'fcurves', None)
+    if fcurves is not None and not getattr(action, 'is_action_layered', False):
+        return fcurves
+    # Blender 4.4+ layered actions keep F-Curves per slot in a channelbag
+    slot = anim_data.action_slot
+    if slot is None:
+        return []
+    channelbag = anim_utils.action_get_channelbag_for_slot(action, slot)
+    return channelbag.fcurves if channelbag else []
+
+
+def is_object_transform_static(obj):
+    """Check whether an object's world matrix can't change between frames.
+    
+    Conservative: any parent, constraint, NLA track, driver or F-Curve
+    on the object's own transform counts as animated.
+    """
+    if obj.parent is not None or obj.constraints:
+        return False
+    anim_data = obj.animation_data
+    if anim_data is None:
+        return True
+    if anim_data.use_nla and any(not track.mute for track in anim_data.nla_tracks):
+        return False
+    for fcurve in anim_data.drivers:
+        if fcurve.data_path in OBJECT_TRANSFORM_PATHS:
+            return False
+    for fcurve in get_action_fcurves(anim_data):
+        if not fcurve.mute and fcurve.data_path in OBJECT_TRANSFORM_PATHS:
+            return False
+    return True
+
+
+def get_bone_fcurves(armature_obj):
+    """Collect the F-Curves that animate the pose bones of an armature.
+    
+    Sampling F-Curves directly is only exact when the action is the sole
+    input to the pose, so this returns None when anything else can move
+    the bones: NLA, drivers, constraints, a parent, an animated object
+    transform or the armature being shown in rest position.
+    
+    Returns:
+        A dict mapping bone names to {property: {array_index: fcurve}},
+        or None if the armature has to be evaluated with frame_set.
+    """
+    if armature_obj.parent is not None or armature_obj.constraints:
+        return None
+    # In rest position the evaluated tails ignore the action entirely
+    if armature_obj.data.pose_position != 'POSE':
+        return None
+    if any(pose_bone.constraints for pose_bone in armature_obj.pose.bones):
+        return None
+    
+    bone_fcurves = {}
+    anim_data = armature_obj.animation_data
+    if anim_data is None:
+        return bone_fcurves
+    
+    if anim_data.drivers or anim_data.use_tweak_mode:
+        return None
+    if anim_data.use_nla and any(not track.mute for track in anim_data.nla_tracks):
+        return None
+    if anim_data.action_influence != 1.0:
+        return None
+    
+    for fcurve in get_action_fcurves(anim_data):
+        # Animsys skips muted F-Curves and F-Curves in muted groups
+        if fcurve.mute or (fcurve.group is not None and fcurve.group.mute):
+            continue
+        data_path = fcurve.data_path
+        if not data_path.startswith(POSE_BONES_PATH_PREFIX):
+            if data_path in OBJECT_TRANSFORM_PATHS:
+                return None
+            continue
+        name_end = data_path.rfind('"]')
+        prop = data_path[name_end + 3:]
+        if prop not in POSE_BONE_TRANSFORM_PATHS:
+            continue
+        bone_name = bpy.utils.unescape_identifier(data_path[len(POSE_BONES_PATH_PREFIX):name_end])
+        bone_fcurves.setdefault(bone_name, {}).setdefault(prop, {})[fcurve.array_index] = fcurve
+    
+    return bone_fcurves
+
+
+def get_pose_bone_basis(pose_bone, fcurves, frame):
+    """Build a pose bone's local (basis) matrix at a frame from its F-Curves.
+    
+    Channels without an F-Curve keep the pose bone's current value.
+    """
+    def sample(prop, values):
+        channel_fcurves = fcurves.get(prop)
+        if channel_fcurves:
+            for index, fcurve in channel_fcurves.items():
+                values[index] = fcurve.evaluate(frame)
+        return values
+    
+    location = sample('location', Vector(pose_bone.location))
+    scale = sample('scale', Vector(pose_bone.scale))
+    
+    rotation_mode = pose_bone.rotation_mode
+    if rotation_mode == 'QUATERNION':
+        rotation = sample('rotation_quaternion', Quaternion(pose_bone.rotation_quaternion))
+        rotation.normalize()
+    elif rotation_mode == 'AXIS_ANGLE':
+        angle, *axis = sample('rotation_axis_angle', list(pose_bone.rotation_axis_angle))
+        axis = Vector(axis)
+        rotation = Quaternion(axis.normalized(), angle) if axis.length > 0 else Quaternion()
+    else:
+        rotation = Euler(sample('rotation_euler', list(pose_bone.rotation_euler)), rotation_mode)
+    
+    return Matrix.LocRotScale(location, rotation, scale)
+
+
+def sample_bone_tails_from_fcurves(armature_obj, pose_bones, bone_fcurves, frames, window_manager=None):
+    """Compute world-space bone tail positions by evaluating F-Curves directly.
+    
+    This avoids a full depsgraph evaluation (scene.frame_set) per frame.
+    Only valid when get_bone_fcurves() returned a dict for the armature.
+    If a window manager is given, its progress indicator is updated per frame.
+    
+    Returns:
+        Array of shape (len(frames), len(pose_bones), 3)
+    """
+    # Monitored bones and all their ancestors, parents before children
+    chain_bones = {}
+    for pose_bone in pose_bones:
+        while pose_bone is not None and pose_bone.name not in chain_bones:
+            chain_bones[pose_bone.name] = pose_bone
+            pose_bone = pose_bone.parent
+    ordered_bones = sorted(chain_bones.values(), key=lambda pb: len(pb.parent_recursive))
+    
+    # Bones with no F-Curves anywhere in their parent chain never move,
+    # so their pose matrices are computed once instead of per frame
+    animated_names = set()
+    for pose_bone in ordered_bones:
+        parent = pose_bone.parent
+        if pose_bone.name in bone_fcurves or (parent is not None and parent.name in animated_names):
+            animated_names.add(pose_bone.name)
+    animated_bones = [pb for pb in ordered_bones if pb.name in animated_names]
+    static_bones = [pb for pb in ordered_bones if pb.name not in animated_names]
+    
+    def get_pose_matrix(pose_bone, pose_matrices, frame):
+        bone = pose_bone.bone
+        basis = get_pose_bone_basis(pose_bone, bone_fcurves.get(pose_bone.name, {}), frame)
+        parent = pose_bone.parent
+        if parent is None:
+            return bone.convert_local_to_pose(basis, bone.matrix_local)
+        return bone.convert_local_to_pose(
+            basis,
+            bone.matrix_local,
+            parent_matrix=pose_matrices[parent.name],
+            parent_matrix_local=parent.bone.matrix_local,
+        )
+    
+    def get_world_tail(pose_bone, pose_matrices):
+        # The tail sits bone.length along the pose matrix's Y axis
+        return world_matrix @ (pose_matrices[pose_bone.name] @ Vector((0.0, pose_bone.bone.length, 0.0)))
+    
+    world_matrix = armature_obj.matrix_world.copy()
+    tails = np.empty((len(frames), len(pose_bones), 3), dtype=np.float64)
+    
+    static_matrices = {}
+    for pose_bone in static_bones:
+        static_matrices[pose_bone.name] = get_pose_matrix(pose_bone, static_matrices, frames[0])
+    
+    animated_indices = []
+    for bone_index, pose_bone in enumerate(pose_bones):
+        if pose_bone.name in animated_names:
+            animated_indices.append((bone_index, pose_bone))
+        else:
+            tails[:, bone_index] = get_world_tail(pose_bone, static_matrices)
+    
+    if not animated_indices:
+        return tails
+    
+    for frame_index, frame in enumerate(frames):
+        if window_manager is not None:
+            window_manager.progress_update(frame_index)
+        pose_matrices = dict(static_matrices)
+        for pose_bone in animated_bones:
+            pose_matrices[pose_bone.name] = get_pose_matrix(pose_bone, pose_matrices, frame)
+        
+        for bone_index, pose_bone in animated_indices:
+            tails[frame_index, bone_index] = get_world_tail(pose_bone, pose_matrices)
+    
+    return tails
+
+
+def sample_bone_tails_with_frame_set(scene, armature_obj, pose_bones, frames, camera_obj=None, window_manager=None):
+    """Compute world-space bone tail positions by evaluating the scene at each frame.
+    
+    Slow but exact for any rig (constraints, drivers, NLA, ...).
+    If a window manager is given, its progress indicator is updated per frame.
+    
+    Returns:
+        (tails, camera_matrices): tails has shape (len(frames), len(pose_bones), 3);
+        camera_matrices has shape (len(frames), 4, 4) with the camera's world
+        matrix per frame, or is None if no camera was given.
+    """
+    tails = np.empty((len(frames), len(pose_bones), 3), dtype=np.float64)
+    camera_matrices = np.empty((len(frames), 4, 4), dtype=np.float64) if camera_obj is not None else None
+    
+    # Read the tails of all pose bones in one call per frame, then keep the monitored ones
+    all_pose_bones = armature_obj.pose.bones
+    bone_indices = {pose_bone.name: i for i, pose_bone in enumerate(all_pose_bones)}
+    monitored_indices = np.array([bone_indices[pose_bone.name] for pose_bone in pose_bones], dtype=np.intp)
+    # PoseBone.tail is float32; a matching buffer lets foreach_get copy it in one go
+    all_tails = np.empty(len(all_pose_bones) * 3, dtype=np.float32)
+    
+    # Read the world matrix once if nothing moves the armature object itself
+    static_world_matrix = None
+    if is_object_transform_static(armature_obj):
+        static_world_matrix = np.array(armature_obj.matrix_world, dtype=np.float64)
+    
+    for frame_index, frame in enumerate(frames):
+        if window_manager is not None:
+            window_manager.progress_update(frame_index)
+        scene.frame_set(frame)
+        
+        # Get world matrix once per frame
+        if static_world_matrix is not None:
+            world_matrix = static_world_matrix
+        else:
+            world_matrix = np.array(armature_obj.matrix_world, dtype=np.float64)
+        all_pose_bones.foreach_get("tail", all_tails)
+        local_tails = all_tails.reshape(-1, 3)[monitored_indices].astype(np.float64)
+        tails[frame_index] = local_tails @ world_matrix[:3, :3].T + world_matrix[:3, 3]
+        
+        if camera_matrices is not None:
+            camera_matrices[frame_index] = camera_obj.matrix_world
+    
+    return tails, camera_matrices
 
 
 class VSE_OT_AddSoundsAtZCrossings(Operator):
@@ -400,38 +756,31 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
     bl_label = "Add Sounds at Z Crossings"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def get_bones_in_collection(self, armature_obj, bone_collection_name):
-        """Get list of bone names that belong to the specified bone collection."""
+    def get_pose_bones_in_collection(self, armature_obj, bone_collection_name):
+        """Get list of pose bones that belong to the specified bone collection."""
         armature_data = armature_obj.data
-        bone_names = []
+        all_pose_bones = armature_obj.pose.bones
         
         if bone_collection_name == 'ALL':
-            return [bone.name for bone in armature_obj.pose.bones]
+            return list(all_pose_bones)
         
         if bone_collection_name == 'SELECTED':
             # Check bone selection state directly from the pose bone
             # In Blender 5.0+, select was moved from Bone to PoseBone
             # Also avoids using bpy.context.selected_pose_bones which is
             # unavailable when the operator is invoked from a sidebar panel
-            for pose_bone in armature_obj.pose.bones:
-                if pose_bone.select:
-                    bone_names.append(pose_bone.name)
-            return bone_names
-        
-        # Blender 4.0+ uses bone collections
-        if hasattr(armature_data, 'collections'):
-            for bcol in armature_data.collections:
-                if bcol.name == bone_collection_name:
-                    # Get bones assigned to this collection
-                    for bone in armature_data.bones:
-                        if hasattr(bone, 'collections') and bcol in bone.collections.values():
-                            bone_names.append(bone.name)
-                        elif hasattr(bcol, 'bones'):
-                            if bone.name in [b.name for b in bcol.bones]:
-                                bone_names.append(bone.name)
-                    break
-        
-        return bone_names
+            return [pose_bone for pose_bone in all_pose_bones if pose_bone.select]
+        
+        bcol = armature_data.collections.get(bone_collection_name)
+        if bcol is None:
+            return []
+        # Get bones assigned to this collection, in armature order
+        member_names = {bone.name for bone in bcol.bones}
+        return [pose_bone for pose_bone in all_pose_bones if pose_bone.name in member_names]
+    
+    def get_bones_in_collection(self, armature_obj, bone_collection_name):
+        """Get list of bone names that belong to the specified bone collection."""
+        return [pose_bone.name for pose_bone in self.get_pose_bones_in_collection(armature_obj, bone_collection_name)]
     
     def execute(self, context):
         settings = context.scene.vse_event_sound_settings
@@ -449,11 +798,11 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
                 return {'CANCELLED'}
         
         # Check if armature exists
-        if armature_name == 'NONE' or armature_name not in bpy.data.objects:
+        armature_obj = bpy.data.objects.get(armature_name) if armature_name != 'NONE' else None
+        if armature_obj is None:
             self.report({'ERROR'}, "Please select a valid armature")
             return {'CANCELLED'}
         
-        armature_obj = bpy.data.objects[armature_name]
         if armature_obj.type != 'ARMATURE':
             self.report({'ERROR'}, f"'{armature_name}' is not an armature")
             return {'CANCELLED'}
@@ -483,13 +832,12 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
         
         # Fall back to default bundled sound if no file selected (single mode only)
         if selection_mode == 'SINGLE' and (not sound_path or not os.path.exists(sound_path)):
-            addon_dir = os.path.dirname(os.path.realpath(__file__))
-            sound_path = os.path.join(addon_dir, "geiger_counter_sound.wav")
-        
-        # Validate sound path exists (skip for random mode which was validated above)
-        if selection_mode == 'SINGLE' and not os.path.exists(sound_path):
-            self.report({'ERROR'}, f"Sound file not found: {sound_path}")
-            return {'CANCELLED'}
+            sound_path = DEFAULT_SOUND_PATH
+            
+            # Validate the fallback exists (random mode was validated above)
+            if not os.path.exists(sound_path):
+                self.report({'ERROR'}, f"Sound file not found: {sound_path}")
+                return {'CANCELLED'}
         
         # Get timeline range
         scene = context.scene
@@ -501,101 +849,122 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
         
         # Get bones to monitor
         bone_collection_name = settings.z_crossing_bone_collection
-        bone_names = self.get_bones_in_collection(armature_obj, bone_collection_name)
+        pose_bones = self.get_pose_bones_in_collection(armature_obj, bone_collection_name)
         
-        if not bone_names:
+        if not pose_bones:
             if bone_collection_name == 'SELECTED':
                 self.report({'ERROR'}, "No bones selected. Select bones in Pose Mode first.")
             else:
                 self.report({'ERROR'}, f"No bones found in bone collection '{bone_collection_name}'")
             return {'CANCELLED'}
         
-        # Get pose bones references once
-        pose_bones = [armature_obj.pose.bones[name] for name in bone_names if name in armature_obj.pose.bones]
-        
-        if not pose_bones:
-            self.report({'ERROR'}, "No valid pose bones found")
-            return {'CANCELLED'}
+        # Sample world-space tail positions of all bones over the timeline.
+        # Evaluating the action's F-Curves directly is much faster than
+        # stepping the scene, but only exact when nothing else drives the pose.
+        frames = range(frame_start, frame_end + 1)
+        # Long timelines take a while; show progress on the mouse cursor
+        window_manager = context.window_manager
+        bone_fcurves = get_bone_fcurves(armature_obj)
+        camera_matrices = None
+        window_manager.progress_begin(0, len(frames))
+        try:
+            if bone_fcurves is not None:
+                tails = sample_bone_tails_from_fcurves(
+                    armature_obj, pose_bones, bone_fcurves, frames, window_manager
+                )
+            else:
+                tails, camera_matrices = sample_bone_tails_with_frame_set(
+                    scene, armature_obj, pose_bones, frames, camera_obj, window_manager
+                )
+        finally:
+            window_manager.progress_end()
+        tail_z = tails[:, :, 2]
         
         # Find all Z-crossing frames with their crossing speeds and bone names
-        # Dict: frame -> (speed, bone_name) - keeps the fastest crossing per frame
-        crossing_data = {}
-        
-        # Track previous Z positions for each bone
-        prev_z = {bone.name: None for bone in pose_bones}
+        # Compare each frame with the previous one for all bones at once
         threshold = settings.z_crossing_threshold
+        prev_z = tail_z[:-1]
+        cur_z = tail_z[1:]
+        if direction == 'BOTH':
+            crossed = ((prev_z < threshold) & (cur_z >= threshold)) | ((prev_z > threshold) & (cur_z <= threshold))
+        elif direction == 'UP':
+            crossed = (prev_z < threshold) & (cur_z >= threshold)
+        else:  # DOWN
+            crossed = (prev_z > threshold) & (cur_z <= threshold)
         
-        # Store position data for camera-based volume & pan calculations
-        crossing_positions = {}  # frame -> (bone_world_pos, camera_matrix)
+        # Crossing speed is the absolute Z delta per frame; keep the fastest
+        # bone per frame (argmax picks the first bone on ties)
+        crossing_speeds = np.where(crossed, np.abs(cur_z - prev_z), -np.inf)
+        fastest_bones = crossing_speeds.argmax(axis=1)
         
-        # Single pass through timeline - evaluate all bones at each frame
-        for frame in range(frame_start, frame_end + 1):
-            scene.frame_set(frame)
-            
-            # Get world matrix once per frame
-            world_matrix = armature_obj.matrix_world
-            
-            # Check all bones at this frame
-            for pose_bone in pose_bones:
-                tail_world = world_matrix @ pose_bone.tail
-                world_z = tail_world.z
-                bone_prev_z = prev_z[pose_bone.name]
-                
-                # Inline crossing check for speed
-                if bone_prev_z is not None:
-                    if direction == 'BOTH':
-                        crossed = (bone_prev_z < threshold and world_z >= threshold) or (bone_prev_z > threshold and world_z <= threshold)
-                    elif direction == 'UP':
-                        crossed = bone_prev_z < threshold and world_z >= threshold
-                    else:  # DOWN
-                        crossed = bone_prev_z > threshold and world_z <= threshold
-                    
-                    if crossed:
-                        # Calculate crossing speed (absolute Z delta per frame)
-                        crossing_speed = abs(world_z - bone_prev_z)
-                        # Keep the maximum speed if multiple bones cross at the same frame
-                        if frame not in crossing_data or crossing_speed > crossing_data[frame][0]:
-                            crossing_data[frame] = (crossing_speed, pose_bone.name)
-                            if use_camera:
-                                crossing_positions[frame] = (
-                                    tail_world.copy(),
-                                    camera_obj.matrix_world.copy(),
-                                )
-                
-                prev_z[pose_bone.name] = world_z
+        # Parallel arrays over the crossings, already in frame order
+        crossing_frame_indices = np.flatnonzero(crossed.any(axis=1)) + 1
+        crossing_bone_indices = fastest_bones[crossing_frame_indices - 1]
+        crossing_frames = (crossing_frame_indices + frame_start).tolist()
+        speeds = crossing_speeds[crossing_frame_indices - 1, crossing_bone_indices]
+        crossing_bone_names = [pose_bones[i].name for i in crossing_bone_indices.tolist()]
+        
+        # Store position data for camera-based volume & pan calculations
+        if use_camera:
+            bone_positions = tails[crossing_frame_indices, crossing_bone_indices]
+            if camera_matrices is not None:
+                crossing_camera_matrices = camera_matrices[crossing_frame_indices]
+            else:
+                # The camera may be animated, so only step the scene to the crossing frames
+                crossing_camera_matrices = np.empty((len(crossing_frames), 4, 4), dtype=np.float64)
+                for crossing_index, frame in enumerate(crossing_frames):
+                    scene.frame_set(frame)
+                    crossing_camera_matrices[crossing_index] = camera_obj.matrix_world
         
         # Restore original frame
-        scene.frame_set(original_frame)
+        if scene.frame_current != original_frame:
+            scene.frame_set(original_frame)
         
         if bone_collection_name == 'ALL':
             source_name = "all bones"
         elif bone_collection_name == 'SELECTED':
-            source_name = f"{len(bone_names)} selected bones"
+            source_name = f"{len(pose_bones)} selected bones"
         else:
             source_name = f"bones in '{bone_collection_name}'"
         
-        if not crossing_data:
+        if not crossing_frames:
             self.report({'WARNING'}, f"No Z crossings found for {source_name}")
             return {'CANCELLED'}
         
-        # Sort frames and normalize speeds
-        crossing_frames = sorted(crossing_data.keys())
-        speeds = [crossing_data[f][0] for f in crossing_frames]  # Extract speed from tuple
-        max_speed = max(speeds) if speeds else 1.0
-        min_speed = min(speeds) if speeds else 0.0
-        speed_range = max_speed - min_speed if max_speed > min_speed else 1.0
+        # Calculate volume from each active effect for all crossings, then combine
+        volumes = np.ones(len(crossing_frames), dtype=np.float64)
+        pans = np.zeros(len(crossing_frames), dtype=np.float64)
+        
+        if use_speed:
+            # Speed: faster crossing → louder
+            max_speed = speeds.max()
+            min_speed = speeds.min()
+            if max_speed > min_speed:
+                speed_span = settings.speed_volume_louder - settings.speed_volume_softer
+                # softer + (speed - min) / range * span, built in one buffer
+                speed_volumes = speeds - min_speed
+                speed_volumes *= speed_span / (max_speed - min_speed)
+                speed_volumes += settings.speed_volume_softer
+                volumes *= speed_volumes
+            else:
+                # All crossings equally fast: every factor is 0
+                volumes *= settings.speed_volume_softer
         
-        # Compute camera distance normalization and horizontal FOV for pan
         if use_camera:
-            distances = []
-            for frame in crossing_frames:
-                bone_pos, cam_matrix = crossing_positions[frame]
-                cam_pos = cam_matrix.translation
-                distance = (bone_pos - cam_pos).length
-                distances.append(distance)
-            max_distance = max(distances) if distances else 1.0
-            min_distance = min(distances) if distances else 0.0
-            distance_range = max_distance - min_distance if max_distance > min_distance else 1.0
+            # Camera distance: closer → louder
+            distances = np.linalg.norm(bone_positions - crossing_camera_matrices[:, :3, 3], axis=1)
+            max_distance = distances.max()
+            min_distance = distances.min()
+            if max_distance > min_distance:
+                camera_span = settings.camera_volume_louder - settings.camera_volume_softer
+                # louder - (distance - min) / range * span, reusing the distances buffer
+                distances -= min_distance
+                distances *= -camera_span / (max_distance - min_distance)
+                distances += settings.camera_volume_louder
+                volumes *= distances
+            else:
+                # All crossings equally far: every factor is 1
+                volumes *= settings.camera_volume_louder
             
             # Compute horizontal FOV for pan normalization
             cam_data = camera_obj.data
@@ -612,6 +981,45 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
                 else:
                     h_fov = 2 * math.atan(math.tan(cam_data.angle / 2) * (aspect_x / aspect_y))
             half_fov = h_fov / 2 if h_fov > 0 else math.radians(30)
+            
+            # Pan: project bone positions into the camera's local space
+            cam_inv = np.linalg.inv(crossing_camera_matrices)
+            local_pos = np.einsum('nij,nj->ni', cam_inv[:, :3, :3], bone_positions) + cam_inv[:, :3, 3]
+            # In camera space: X = right, -Z = forward
+            depth = -local_pos[:, 2]
+            in_front = depth > 0
+            pans[in_front] = np.clip(np.arctan2(local_pos[in_front, 0], depth[in_front]) / half_fov, -1.0, 1.0)
+        
+        # Apply random variation (if enabled): each volume is drawn
+        # between (1 - randomness) * volume and volume
+        volume_randomness = settings.volume_randomness
+        if settings.use_volume_randomness and volume_randomness > 0:
+            rng = np.random.default_rng()
+            volumes *= rng.uniform(1.0 - volume_randomness, 1.0, size=volumes.shape)
+        
+        # Format strip names with volume (and pan info when camera is active)
+        # for all crossings at once; np.rint rounds half to even like round()
+        volume_percents = np.rint(volumes * 100).astype(np.int64).tolist()
+        if use_camera:
+            pan_percents = (np.abs(pans) * 100).astype(np.int64).tolist()
+            strip_display_names = []
+            for bone_name, volume_percent, pan, pan_percent in zip(
+                    crossing_bone_names, volume_percents, pans.tolist(), pan_percents):
+                if pan < -0.01:
+                    pan_str = f"L{pan_percent}"
+                elif pan > 0.01:
+                    pan_str = f"R{pan_percent}"
+                else:
+                    pan_str = "C"
+                strip_display_names.append(f"{bone_name}_v{volume_percent}_{pan_str}")
+        else:
+            strip_display_names = [
+                f"{bone_name}_v{volume_percent}"
+                for bone_name, volume_percent in zip(crossing_bone_names, volume_percents)
+            ]
+        
+        volumes = volumes.tolist()
+        pans = pans.tolist()
         
         # Get the correct scene for the sequencer
         seq_scene = get_sequencer_scene(context)
@@ -622,119 +1030,91 @@ class VSE_OT_AddSoundsAtZCrossings(Operator):
         
         sed = seq_scene.sequence_editor
         
+        # Resolve the strip API once, before entering the insertion loop
+        try:
+            new_sound = get_new_strips_collection(sed).new_sound
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        
         # Find the first completely empty channel for this import batch
         base_channel = find_next_available_channel(sed)
         
         # Insert sounds at crossing frames
-        inserted_count = 0
         new_strips = []
-        use_randomness = settings.use_volume_randomness
-        volume_randomness = settings.volume_randomness
         
-        # Track bone colors - each unique bone gets a consistent color
+        # Each unique bone gets a consistent color, assigned in order of first crossing
         bone_color_map = {}
-        # Track which bone each strip belongs to (for reapplying colors after channel separation)
-        strip_bone_map = {}
+        bone_color_tags = {}
+        for bone_name in crossing_bone_names:
+            if bone_name not in bone_color_tags:
+                bone_color_tags[bone_name] = STRIP_COLOR_TAGS[get_bone_color_index(bone_name, bone_color_map) - 1]
         
-        for frame in crossing_frames:
-            try:
-                # Get the bone name that triggered this crossing
-                crossing_speed, bone_name = crossing_data[frame]
-                
-                # Determine which sound file to use
-                if selection_mode == 'RANDOM' and available_sound_files:
-                    current_sound_path = os.path.join(sound_folder, random.choice(available_sound_files))
-                else:
-                    current_sound_path = sound_path
+        # Pick the sound for every crossing up front, joining the folder path
+        # once per file rather than once per strip
+        if selection_mode == 'RANDOM' and available_sound_files:
+            available_sound_paths = [os.path.join(sound_folder, filename) for filename in available_sound_files]
+            strip_sound_paths = random.choices(available_sound_paths, k=len(crossing_frames))
+        else:
+            strip_sound_paths = [sound_path] * len(crossing_frames)
+        
+        # Bind functions called per strip to locals
+        progress_update = window_manager.progress_update
+        add_new_strip = new_strips.append
+        # Strip properties available in this Blender version, probed on the first new strip
+        strip_api_probed = False
+        supports_color_tag = supports_volume = supports_pan = False
+        
+        window_manager.progress_begin(0, len(crossing_frames))
+        try:
+            for crossing_index, frame in enumerate(crossing_frames):
+                progress_update(crossing_index)
                 
-                # Calculate volume from each active effect, then combine
-                pan = 0.0
-                volume = 1.0
+                # Get the bone name that triggered this crossing
+                bone_name = crossing_bone_names[crossing_index]
                 
-                if use_speed:
-                    # Speed: faster crossing → louder
-                    if speed_range > 0:
-                        speed_factor = (crossing_speed - min_speed) / speed_range
-                    else:
-                        speed_factor = 1.0
-                    speed_vol = settings.speed_volume_softer + speed_factor * (settings.speed_volume_louder - settings.speed_volume_softer)
-                    volume *= speed_vol
+                current_sound_path = strip_sound_paths[crossing_index]
                 
-                if use_camera:
-                    # Camera distance: closer → louder
-                    bone_pos, cam_matrix = crossing_positions[frame]
-                    cam_pos = cam_matrix.translation
-                    distance = (bone_pos - cam_pos).length
-                    if distance_range > 0:
-                        camera_factor = 1.0 - (distance - min_distance) / distance_range
-                    else:
-                        camera_factor = 1.0
-                    cam_vol = settings.camera_volume_softer + camera_factor * (settings.camera_volume_louder - settings.camera_volume_softer)
-                    volume *= cam_vol
-                    
-                    # Pan: project bone position into camera's local space
-                    cam_inv = cam_matrix.inverted()
-                    local_pos = cam_inv @ bone_pos
-                    # In camera space: X = right, -Z = forward
-                    depth = -local_pos.z
-                    if depth > 0:
-                        angle = math.atan2(local_pos.x, depth)
-                        pan = max(-1.0, min(1.0, angle / half_fov))
-                    else:
-                        pan = 0.0
+                final_volume = volumes[crossing_index]
+                pan = pans[crossing_index]
                 
-                # Apply random variation (if enabled)
-                if use_randomness:
-                    final_volume = get_random_volume(volume, volume_randomness)
-                else:
-                    final_volume = volume
+                try:
+                    strip = new_sound(
+                        name=strip_display_names[crossing_index],
+                        filepath=current_sound_path,
+                        channel=base_channel,
+                        frame_start=frame
+                    )
+                except Exception as e:
+                    self.report({'WARNING'}, f"Failed to add strip at frame {frame}: {e}")
+                    continue
                 
-                # Format name with volume (and pan info when camera is active)
-                volume_percent = int(round(final_volume * 100))
-                if use_camera:
-                    if pan < -0.01:
-                        pan_str = f"L{int(abs(pan) * 100)}"
-                    elif pan > 0.01:
-                        pan_str = f"R{int(abs(pan) * 100)}"
-                    else:
-                        pan_str = "C"
-                    strip_display_name = f"{bone_name}_v{volume_percent}_{pan_str}"
-                else:
-                    strip_display_name = f"{bone_name}_v{volume_percent}"
-                
-                strip = add_sound_strip(
-                    sed,
-                    name=strip_display_name,
-                    filepath=current_sound_path,
-                    channel=base_channel,
-                    frame_start=frame
-                )
+                if not strip_api_probed:
+                    # Blender 4.0+ uses color_tag (enum) with COLOR_01 through COLOR_09
+                    supports_color_tag = hasattr(strip, 'color_tag')
+                    supports_volume = hasattr(strip, 'volume')
+                    supports_pan = hasattr(strip, 'pan')
+                    strip_api_probed = True
                 
                 # Apply color based on the bone name (each bone gets a unique color)
-                apply_strip_color_by_bone(strip, bone_name, bone_color_map)
-                
-                # Track which bone this strip belongs to
-                strip_bone_map[strip] = bone_name
+                if supports_color_tag:
+                    strip.color_tag = bone_color_tags[bone_name]
                 
                 # Apply the calculated volume and pan
-                if hasattr(strip, 'volume'):
+                if supports_volume:
                     strip.volume = final_volume
-                if use_camera and hasattr(strip, 'pan'):
+                if use_camera and supports_pan:
                     strip.pan = pan
                 
-                new_strips.append(strip)
-                inserted_count += 1
-            except Exception as e:
-                self.report({'WARNING'}, f"Failed to add strip at frame {frame}: {e}")
+                add_new_strip(strip)
+        finally:
+            window_manager.progress_end()
         
         # Separate overlapping strips onto different channels (starting from base_channel)
         if new_strips:
             separate_overlapping_strips(new_strips, base_channel)
-            # Reapply bone-based colors after channel separation (strips may have moved)
-            for strip in new_strips:
-                if strip in strip_bone_map:
-                    apply_strip_color_by_bone(strip, strip_bone_map[strip], bone_color_map)
         
+        inserted_count = len(new_strips)
         self.report({'INFO'}, f"Added {inserted_count} sounds at Z-crossing frames (channel {base_channel}+)")
         return {'FINISHED'}
 
@@ -778,9 +1158,7 @@ class VSE_OT_UseDefaultSounds(Operator):
     bl_options = {'REGISTER'}
     
     def execute(self, context):
-        # Get the path to the bundled sounds folder
-        addon_dir = os.path.dirname(os.path.realpath(__file__))
-        sounds_folder = os.path.join(addon_dir, "sounds")
+        sounds_folder = DEFAULT_SOUNDS_DIR
         
         if os.path.isdir(sounds_folder):
             context.scene.vse_event_sound_settings.sound_folder = sounds_folder
@@ -807,12 +1185,15 @@ class VSE_PT_MotionSoundsPanel(Panel):
         col = layout.column(align=True)
         col.label(text="Sound Folder:", icon='FILE_FOLDER')
         
-        row = col.row(align=True)
+        # The status label is the only item on its line, so it needs no row
         if settings.sound_folder:
-            folder_name = os.path.basename(os.path.normpath(settings.sound_folder))
-            row.label(text=folder_name, icon='CHECKMARK')
+            folder_name = settings.sound_folder_name
+            if not folder_name:
+                # Files saved before the name was stored
+                folder_name = os.path.basename(os.path.normpath(settings.sound_folder))
+            col.label(text=folder_name, icon='CHECKMARK')
         else:
-            row.label(text="Not selected", icon='ERROR')
+            col.label(text="Not selected", icon='ERROR')
         
         row = col.row(align=True)
         row.operator(
@@ -879,6 +1260,7 @@ class VSE_PT_CameraVolumePanPanel(Panel):
     bl_region_type = 'UI'
     bl_category = "Motion Sounds"
     bl_parent_id = "VSE_PT_motion_sounds_panel"
+    bl_options = {'DEFAULT_CLOSED'}
     bl_order = 2
 
     def draw_header(self, context):
@@ -905,6 +1287,7 @@ class VSE_PT_RandomizeVolumePanel(Panel):
     bl_region_type = 'UI'
     bl_category = "Motion Sounds"
     bl_parent_id = "VSE_PT_motion_sounds_panel"
+    bl_options = {'DEFAULT_CLOSED'}
     bl_order = 3
 
     def draw_header(self, context):
@@ -985,8 +1368,25 @@ class VSE_PT_RenderAudioPanel(Panel):
 
 
 def register():
-    bpy.types.Scene.vse_event_sound_settings = PointerProperty(type=VSE_PG_EventSoundSettings)
+    # Registering twice (e.g. a reload without unregister) must not stack
+    # properties or handlers
+    if not hasattr(bpy.types.Scene, "vse_event_sound_settings"):
+        bpy.types.Scene.vse_event_sound_settings = PointerProperty(type=VSE_PG_EventSoundSettings)
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    subscribe_to_renames()
 
 
 def unregister():
-    del bpy.types.Scene.vse_event_sound_settings
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    _enum_items_cache.clear()
+    _sound_files_cache.clear()
+    if hasattr(bpy.types.Scene, "vse_event_sound_settings"):
+        del bpy.types.Scene.vse_event_sound_settings